@@ -25,7 +25,19 @@ if __name__ == "__main__":
         help="Type of parser to use (default: simple)",
         default="simple",
     )
-    arg_parser.add_argument("filename", help="The filename of the policy to parse.")
+    arg_parser.add_argument(
+        "-j",
+        "--jobs",
+        dest="max_workers",
+        type=int,
+        help=(
+            "Number of processes used to build the top-level sections of the catalog (default: 1). "
+            "Starting the processes has a cost, so this only helps on multi-core machines with large "
+            "policies (dozens of top-level sections with thousands of subsections); otherwise it is slower."
+        ),
+        default=1,
+    )
+    arg_parser.add_argument("filename", help="The filename of the policy to parse, or '-' to read from stdin.")
 
     args = arg_parser.parse_args()
 
@@ -54,11 +66,18 @@ if __name__ == "__main__":
 
     policy_file_path = Path(args.filename)
 
-    if policy_file_path.exists() and policy_file_path.is_file():
+    if args.filename == "-":
+        policy_catalog = oscal_parser.policy_to_catalog(
+            parse_config=parser_config,
+            policy_text=sys.stdin.read().splitlines(),
+            max_workers=args.max_workers,
+        )
+    elif policy_file_path.exists() and policy_file_path.is_file():
         with open(policy_file_path) as common_file:
             policy_catalog = oscal_parser.policy_to_catalog(
                 parse_config=parser_config,
                 policy_text=common_file.read().splitlines(),
+                max_workers=args.max_workers,
             )
     else:
         print("You provided an argument that does not exist or is not a file.")
@@ -6,12 +6,49 @@ import re
 import uuid
 from html.parser import HTMLParser
 from typing import Any
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+from functools import lru_cache
 
 from . import AbstractParser
 
+# Precompile the regex we use on every line
+html_tag_re = re.compile("<.*?>")
+header_hashes_re = re.compile("#+")
+
+
+# utility function to determine whether a line of text has "requirement words" in it
+def is_requirement(line: str, normative_keywords: tuple[str, ...]) -> bool:
+    return any(keyword in line for keyword in normative_keywords)
+
+
+# Classify a statement and strip any html from it in a single pass.
+# Policies repeat a lot of boilerplate sentences, so we remember the most recent results.
+# Only use this for single lines - tables are large and rarely repeat.
+@lru_cache(maxsize=4096)
+def normalize_statement(line: str, normative_keywords: tuple[str, ...]) -> tuple[bool, str]:
+    is_normative = is_requirement(line, normative_keywords)
+    if "<" in line:
+        return is_normative, html_tag_re.sub("", line)
+    else:
+        return is_normative, line
+
+
+# Worker entry point for building a chapter in a separate process.
+# It must live at module level so that it can be pickled.
+def build_chapter_group(parser_config: dict[str, Any], chapter: list[list[str]]) -> catalog.Group:
+    chapter_parser = SimpleOscalParser()
+    chapter_parser.parser_config = parser_config
+    # The group is pickled to send it back to the main process. Unpickling does not run the
+    # validators again - they already ran here when the group was built.
+    return chapter_parser.chapter_to_group(chapter)
+
+
 class SimpleOscalParser(AbstractParser):
     # NOTE: This parser relies heavily on the specific format of the tokenized CP documents.
-    def policy_to_catalog(self, parse_config: dict[str, Any], policy_text: list[str]) -> document.Document:
+    def policy_to_catalog(
+        self, parse_config: dict[str, Any], policy_text: list[str], max_workers: int = 1
+    ) -> document.Document:
         # First, create an object variable representing the parser configuration toml file 
         if "parser-configuration" in parse_config.keys():
             self.parser_config: dict[str, Any] = parse_config["parser-configuration"]
@@ -49,13 +86,11 @@ class SimpleOscalParser(AbstractParser):
         # Initialize an empty back-matter for later
         backmatter = None
 
-        # We keep a stack to represent the current place in the TOC
-        parent_stack: list[catalog.Group] = []
-
-        # We also keep a list of ordered sections add to the final catalog
-        section_groups: list[catalog.Group] = []
+        # We split the document into chapters - a top-level section and every
+        # section nested beneath it. Each chapter can be built independently.
+        chapters: list[list[list[str]]] = []
 
-        # Step through the sections and generate the appropriate OSCAL objects.
+        # Step through the sections and sort them into chapters.
         # We skip the first section because is it the title page and other stuff
         for section in sections[1:]:
             # Check for a couple of special sections that we expect to see: TOC and References
@@ -68,57 +103,31 @@ class SimpleOscalParser(AbstractParser):
                 # Pass everything except the title line to parse_backmatter
                 backmatter = self.parse_backmatter(section[1:])
                 continue
-            
-            # Assume every other section is a section with requirements
-            # The first line has the section title, and because ift is MD,
-            # the number of hashes indicate the depth in the TOC
-            header_hashes = re.match(r"#+", section[0])
-            if header_hashes is not None:
-                section_depth = len(header_hashes.group(0))
-
-                # Parse the section as a group
-                current_group = self.section_to_group(
-                    section_contents=section, section_depth=section_depth
-                )
 
-                if current_group is None:
+            # Assume every other section is a section with requirements
+            if self.get_section_depth(section[0]) == 1:
+                if not self.get_section_header(section[0]):
                     # Sometimes we get blank headers in the Markdown. skip these.
                     continue
-                # We use a stack to keep track of the heierarchy
-                if section_depth == 1:
-                    if parent_stack:
-                        parent_stack[0] = current_group
-                    else:
-                        # e.g. this is the first run through the loop
-                        parent_stack = [current_group]
-
-                    # Add the top-level group to the final list of groups
-                    section_groups.append(parent_stack[0])
-                else:
-                    # Careful! If we jump more than one level at a time, bad things could happen
-                    if section_depth > len(parent_stack):
-                        parent_stack.append(current_group)
-                        # Add current group to the section above
-                        self.add_subsection_to_parent(
-                            parent_stack[section_depth - 2], current_group
-                        )
-                    elif section_depth == len(parent_stack):
-                        # Replace the previous TOC leaf node with current
-                        parent_stack[section_depth - 1] = current_group
-                        self.add_subsection_to_parent(
-                            parent_stack[section_depth - 2], current_group
-                        )
-                    elif section_depth < len(parent_stack):
-                        # Trim the stack
-                        parent_stack = parent_stack[:section_depth]
-                        # Replace TOC leaf node with current
-                        parent_stack[section_depth - 1] = current_group
-                        self.add_subsection_to_parent(
-                            parent_stack[section_depth - 2], current_group
-                        )
+                # A top-level section starts a new chapter
+                chapters.append([section])
+            elif chapters:
+                chapters[-1].append(section)
             else:
-                raise Exception("Section does not have a title")
+                raise Exception(f"Section appears before the first top-level section: {section[0]}")
 
+        # Build the group for each chapter. If we have more than one worker, the chapters
+        # are built in separate processes.
+        section_groups: list[catalog.Group] = []
+        if max_workers > 1 and len(chapters) > 1:
+            with ProcessPoolExecutor(max_workers=max_workers) as executor:
+                # map returns results in the order of the chapters, so the output is the same as a serial run
+                section_groups.extend(
+                    executor.map(build_chapter_group, repeat(self.parser_config), chapters)
+                )
+        else:
+            for chapter in chapters:
+                section_groups.append(self.chapter_to_group(chapter))
 
         if not backmatter:
             # back-matter is required, so if we couldn't initialize it, we create an empty one now.
@@ -135,7 +144,7 @@ class SimpleOscalParser(AbstractParser):
 
     # pandoc leaves some "span" tags in the document, so we need to strip html out of text
     def strip_html_from_text(self, input: str) -> str:
-        return re.sub("<.*?>", "", input)
+        return html_tag_re.sub("", input)
     
     # Sometimes we need to strip markdown out of a line to process it. This function strips out the most common MD tags
     def strip_markdown_from_text(self, input:str) -> str:
@@ -144,14 +153,6 @@ class SimpleOscalParser(AbstractParser):
         return input
 
 
-    # utility function to determine whether a line of text has "requirement words" in it
-    def is_requirement(self, input: str) -> bool:
-        if any([keyword in input for keyword in self.parser_config["normative_keywords"]]):
-            return True
-        else:
-            return False
-
-
     # Pass in a subsection and it's parent, return the parent with the child attached
     def add_subsection_to_parent(
         self, parent: catalog.Group, child: catalog.Group
@@ -163,19 +164,66 @@ class SimpleOscalParser(AbstractParser):
 
         return parent
 
+    # The first line of a section has the section title, and because it is MD,
+    # the number of hashes indicate the depth in the TOC
+    def get_section_depth(self, header_line: str) -> int:
+        header_hashes = header_hashes_re.match(header_line)
+        if header_hashes is not None:
+            return len(header_hashes.group(0))
+        else:
+            raise Exception("Section does not have a title")
+
+    # Strip off the leading hashes, the trailing space and any html from a section header
+    def get_section_header(self, header_line: str) -> str:
+        return self.strip_html_from_text(header_hashes_re.sub("", header_line).strip())
+
+    # Build a top-level section and all of its subsections into a single group
+    def chapter_to_group(self, chapter: list[list[str]]) -> catalog.Group:
+        # The first section is the top-level section, and is never blank
+        chapter_group = self.section_to_group(section_contents=chapter[0], section_depth=1)
+        if chapter_group is None:
+            raise Exception(f"Chapter does not have a title: {chapter[0][0]}")
+
+        # We use a stack to keep track of the heierarchy. Each entry has the depth of the section,
+        # so that headings which skip a level are still placed next to their siblings.
+        parent_stack: list[tuple[int, catalog.Group]] = [(1, chapter_group)]
+
+        for section in chapter[1:]:
+            section_depth = self.get_section_depth(section[0])
+
+            # Parse the section as a group
+            current_group = self.section_to_group(
+                section_contents=section, section_depth=section_depth
+            )
+
+            if current_group is None:
+                # Sometimes we get blank headers in the Markdown. skip these.
+                continue
+
+            # Trim the stack back to the closest section above this one. The chapter itself
+            # is at depth 1, so it is never removed.
+            while parent_stack[-1][0] >= section_depth:
+                parent_stack.pop()
+
+            # Add current group to the section above, and make it the new TOC leaf node
+            self.add_subsection_to_parent(parent_stack[-1][1], current_group)
+            parent_stack.append((section_depth, current_group))
+
+        return chapter_group
+
     def section_to_group(
         self, section_contents: list[str], section_depth: int
     ) -> catalog.Group | None:
         # First line is the section header.
-        # Strip off the leading hashes and the trailing space
-        section_header = self.strip_html_from_text(re.sub("#+", "", section_contents[0]).strip())
+        section_header = self.get_section_header(section_contents[0])
 
         # Sometimes we get empty headings - if so we'll skip this whole process
         if not section_header:
             return None
         else:
             # Create a UUID to represent the group_id
-            group_id = f"group-{uuid.uuid4()}"
+            group_uuid = uuid.uuid4()
+            group_id = f"group-{group_uuid}"
 
             section_group = catalog.Group(
                 id=group_id,
@@ -186,6 +234,7 @@ class SimpleOscalParser(AbstractParser):
                 # Process contents to identify any text that contains requriements
                 normative_statements: list[str] = []
                 informative_statements: list[str] = []
+                normative_keywords = tuple(self.parser_config["normative_keywords"])
                 table_start = -1 # Track starting point of a table. Negative indicates we're not in a table at all
                 contents_to_parse = section_contents[1:]
                 for line_number, line in enumerate(contents_to_parse): # Skip the first line, it's the title.
@@ -206,9 +255,10 @@ class SimpleOscalParser(AbstractParser):
 
                         one_line_table = " ".join(contents_to_parse[table_start:table_end+1])
 
-                        if self.is_requirement(one_line_table):
-                            normative_statements.append(one_line_table)
+                        if is_requirement(one_line_table, normative_keywords):
+                            normative_statements.append(self.strip_html_from_text(one_line_table))
                         else:
+                            # Informative tables keep their html
                             informative_statements.append(one_line_table)
                         
                         table_start = -1
@@ -217,10 +267,11 @@ class SimpleOscalParser(AbstractParser):
                         continue
                     else:
                         # We're not in a table - process this as a regular line
-                        if self.is_requirement(line):
-                            normative_statements.append(self.strip_html_from_text(line))
+                        is_normative, statement = normalize_statement(line, normative_keywords)
+                        if is_normative:
+                            normative_statements.append(statement)
                         else:
-                            informative_statements.append(self.strip_html_from_text(line))
+                            informative_statements.append(statement)
 
                 # If a section has any requirements, they must go into an inner control group
                 # If a section has no requriements, but some statements, they should be added as parts of the group
@@ -239,7 +290,7 @@ class SimpleOscalParser(AbstractParser):
                     # Under some circumstances, 
 
                     section_control_group: catalog.Group = catalog.Group(
-                        id=re.sub("group", "control", group_id),
+                        id=f"control-{group_uuid}",
                         title=f"{section_header}: Group for Normative Statements",
                     )
                     section_control_group.controls = section_control_list
@@ -269,7 +320,8 @@ class SimpleOscalParser(AbstractParser):
     ) -> catalog.Control:
         # Strip off the leading hashes and the surrounding spaces
         control_title = f"{section_title}: Normative Statements"
-        control_id = f"ctrl-{uuid.uuid4()}"
+        control_uuid = uuid.uuid4()
+        control_id = f"ctrl-{control_uuid}"
         control = catalog.Control(
             id=control_id,
             title=control_title,
@@ -279,12 +331,12 @@ class SimpleOscalParser(AbstractParser):
         parts: list[catalog.BasePart] = []
         part_num = 1
         for section_line_text in control_list:
-            # If we get here, it's a regular text line
+            # If we get here, it's a regular text line. The html has already been stripped by normalize_statement
             parts.append(
                 catalog.StatementPart(
-                    id=f"{re.sub("ctrl", "stmt", control_id)}-{part_num}",
+                    id=f"stmt-{control_uuid}-{part_num}",
                     name="statement",
-                    prose=self.strip_html_from_text(section_line_text), # Strip any html left in.
+                    prose=section_line_text,
                 )
             )
             part_num += 1
@@ -1,37 +1,47 @@
 # Ignoring types here because stanza doesn't have type stubs
 # type:ignore
 
-import stanza
 import pathlib
 import argparse
+import functools
+import os
 import re
+import sys
+import tempfile
+from typing import Callable, Iterable, Iterator, TextIO
 
-nlp = stanza.Pipeline(
-    "en", download_method=stanza.DownloadMethod.REUSE_RESOURCES, processors="tokenize"
-)
+
+# Loading the stanza models is slow, so the pipeline is only built the first time it is needed
+@functools.cache
+def get_pipeline():
+    import stanza
+
+    return stanza.Pipeline(
+        "en", download_method=stanza.DownloadMethod.REUSE_RESOURCES, processors="tokenize"
+    )
 
 
 def get_sentences(input: str) -> list[str]:
     sentences: list[str] = []
-    processed_text: stanza.Document = nlp(input)
+    processed_text = get_pipeline()(input)
     for sentence in processed_text.sentences:
         sentences.append(sentence.text)
     return sentences
 
 
-def parse_document(policy_lines: list[str]) -> list[str]:
-    line_count = len(policy_lines)
-
+# Lines are tokenized one at a time, so only the current line is held in memory.
+def parse_document(
+    policy_lines: Iterable[str], split_sentences: Callable[[str], list[str]] = get_sentences
+) -> Iterator[str]:
     # Precompile some regex we'll be using repeatedly
     # first, the regex for a markdown link
     md_link_re = re.compile(r"\[(?P<link>.*?)\]\((?P<target>.*?)\)(?P<text>.*)")
 
-    processed_lines: list[str] = []
-    for index, line in enumerate(policy_lines):
-        # Check for blank lines (lines with only '\n') and just add them to the processed_lines list
+    for line in policy_lines:
+        # Check for blank lines (lines with only '\n') and just yield an empty line
         # Skip the rest of the processing for these lines
         if len(line) == 1:
-            processed_lines.append("")
+            yield ""
             continue
 
         # strip trailing newline from line
@@ -40,15 +50,15 @@ def parse_document(policy_lines: list[str]) -> list[str]:
 
         # Don't process section headers
         if line[0] == "#":
-            processed_lines.append(line)
+            yield line
 
         # Don't process image links if they are on their own line
         elif line[0] == "!" and line[-1] in [")", "}"]:
-            processed_lines.append(line)
+            yield line
 
         # Process lines starting with links "[" separately
         elif line[0] == "[":
-            processed_lines.append(line)
+            yield line
             # **This code isn't quite ready yet** - Based on manual review, we can skip the links.
             # line_matches = md_link_re.match(line)
             # if line_matches is not None:
@@ -71,7 +81,7 @@ def parse_document(policy_lines: list[str]) -> list[str]:
         # if the line looks like a table
         elif line[0] == "|":
             # TODO: Implement html tables for this - Turns out there's nothing interesting in the tables. Just skipping
-            processed_lines.append(line)
+            yield line
             # This doesn't quite work - need to implement as html table
             # split the line into columns
             # columns = line.split("|")
@@ -88,31 +98,87 @@ def parse_document(policy_lines: list[str]) -> list[str]:
 
         # Preserve empty lines - insert a blank string
         elif line[0] == "\n":
-            processed_lines.append("")
+            yield ""
 
         # If we get here, we're probably dealing with a regular line of text
         else:
-            processed_lines.extend(get_sentences(input=line))
-
-    return processed_lines
+            yield from split_sentences(line)
+
+
+def write_lines(processed_lines: Iterable[str], output: TextIO) -> None:
+    # Separate lines with a newline, without terminating the last one
+    separator = ""
+    for processed_line in processed_lines:
+        output.write(separator)
+        output.write(processed_line)
+        separator = "\n"
+
+
+def tokenize_file(
+    filename: str, output: str | None = None, split_sentences: Callable[[str], list[str]] = get_sentences
+) -> None:
+    # A filename or output of '-' means stdin or stdout
+    if output is None:
+        output = "-" if filename == "-" else str(pathlib.Path(filename).with_suffix(".tokenized"))
+
+    if filename != "-" and output != "-":
+        if pathlib.Path(output).resolve() == pathlib.Path(filename).resolve():
+            raise ValueError(f"Output file would overwrite the input file: {output}")
+
+    # open the source file and stream the tokenized lines to the output
+    raw_doc = sys.stdin if filename == "-" else open(filename, encoding="utf-8")
+    try:
+        if output == "-":
+            write_lines(parse_document(raw_doc, split_sentences), sys.stdout)
+        else:
+            # Write to a temporary file next to the output, and only move it into place once
+            # tokenization has finished, so an interrupted run never leaves a partial file behind
+            output_file = pathlib.Path(output)
+            with tempfile.NamedTemporaryFile(
+                mode="w",
+                encoding="utf-8",
+                dir=output_file.parent,
+                prefix=f".{output_file.name}.",
+                suffix=".tmp",
+                delete=False,
+            ) as tokenized_doc:
+                try:
+                    write_lines(parse_document(raw_doc, split_sentences), tokenized_doc)
+                    tokenized_doc.close()
+                    # Temporary files are only readable by their owner - give the output the
+                    # same permissions a regular open() would have
+                    umask = os.umask(0)
+                    os.umask(umask)
+                    os.chmod(tokenized_doc.name, 0o666 & ~umask)
+                    os.replace(tokenized_doc.name, output_file)
+                except BaseException:
+                    tokenized_doc.close()
+                    if os.path.exists(tokenized_doc.name):
+                        os.remove(tokenized_doc.name)
+                    raise
+    finally:
+        if raw_doc is not sys.stdin:
+            raw_doc.close()
 
 
 if __name__ == "__main__":
     arg_parser = argparse.ArgumentParser()
 
-    arg_parser.add_argument("filename")
+    arg_parser.add_argument(
+        "filename", help="The markdown file to tokenize, or '-' to read from stdin."
+    )
+    arg_parser.add_argument(
+        "-o",
+        "--output",
+        dest="output",
+        help="The file to write the tokenized lines to, or '-' for stdout (default: <filename>.tokenized, or stdout when reading stdin)",
+        default=None,
+    )
 
     args = arg_parser.parse_args()
 
-    source_file = pathlib.Path(args.filename)
-
-    output_file = source_file.with_suffix(".tokenized")
-
-    # open and read the source file
-    with open(source_file) as raw_doc:
-        policy_lines = raw_doc.readlines()
-
-    processed_lines = parse_document(policy_lines=policy_lines)
-
-    # Write out the tokenized file, terminating each string with a newline
-    output_file.write_text("\n".join(processed_lines), encoding="utf-8")
+    try:
+        tokenize_file(filename=args.filename, output=args.output)
+    except ValueError as e:
+        print(e)
+        exit(1)
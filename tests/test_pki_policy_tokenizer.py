@@ -0,0 +1,134 @@
+import io
+import os
+import pathlib
+import tempfile
+import unittest
+from unittest import mock
+
+from pki_policy_tokenizer.__main__ import parse_document, tokenize_file, write_lines
+
+
+# Stands in for stanza so the tests don't need the language models
+def split_sentences(input: str) -> list[str]:
+    return [sentence.strip() + "." for sentence in input.split(".") if sentence.strip()]
+
+
+policy_lines = [
+    "# 1 Introduction\n",
+    "\n",
+    "The CA shall do one thing. The RA must do another.\n",
+    "|a|b|\n",
+    "![image](picture.png)\n",
+    "[link](#target) more text\n",
+    "Last line without a newline",
+]
+
+tokenized_lines = [
+    "# 1 Introduction",
+    "",
+    "The CA shall do one thing.",
+    "The RA must do another.",
+    "|a|b|",
+    "![image](picture.png)",
+    "[link](#target) more text",
+    "Last line without a newline.",
+]
+
+
+class TestParseDocument(unittest.TestCase):
+    def test_lines_are_tokenized(self):
+        self.assertEqual(list(parse_document(policy_lines, split_sentences)), tokenized_lines)
+
+    def test_input_is_read_lazily(self):
+        lines_read: list[str] = []
+
+        def read_lines():
+            for line in policy_lines:
+                lines_read.append(line)
+                yield line
+
+        tokenized = parse_document(read_lines(), split_sentences)
+        self.assertEqual(next(tokenized), "# 1 Introduction")
+        self.assertEqual(lines_read, policy_lines[:1])
+
+
+class TestWriteLines(unittest.TestCase):
+    def test_last_line_has_no_newline(self):
+        output = io.StringIO()
+        write_lines(["first", "", "last"], output)
+        self.assertEqual(output.getvalue(), "first\n\nlast")
+
+    def test_no_lines(self):
+        output = io.StringIO()
+        write_lines([], output)
+        self.assertEqual(output.getvalue(), "")
+
+
+class TestTokenizeFile(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.policy_file = pathlib.Path(self.directory.name, "policy.md")
+        self.policy_file.write_text("".join(policy_lines), encoding="utf-8")
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_stdin_to_stdout(self):
+        with mock.patch("sys.stdin", io.StringIO("".join(policy_lines))), mock.patch(
+            "sys.stdout", new_callable=io.StringIO
+        ) as stdout:
+            tokenize_file("-", split_sentences=split_sentences)
+
+        self.assertEqual(stdout.getvalue(), "\n".join(tokenized_lines))
+
+    def test_default_output_file(self):
+        tokenize_file(str(self.policy_file), split_sentences=split_sentences)
+
+        output_file = self.policy_file.with_suffix(".tokenized")
+        self.assertEqual(output_file.read_text(encoding="utf-8"), "\n".join(tokenized_lines))
+        # Only the input and output are left in the directory - no temporary files
+        self.assertEqual(sorted(os.listdir(self.directory.name)), ["policy.md", "policy.tokenized"])
+
+    def test_output_file_has_regular_permissions(self):
+        tokenize_file(str(self.policy_file), split_sentences=split_sentences)
+
+        umask = os.umask(0)
+        os.umask(umask)
+        output_mode = self.policy_file.with_suffix(".tokenized").stat().st_mode & 0o777
+        self.assertEqual(output_mode, 0o666 & ~umask)
+
+    def test_failed_run_keeps_previous_output(self):
+        output_file = self.policy_file.with_suffix(".tokenized")
+        output_file.write_text("previous output", encoding="utf-8")
+
+        def failing_split_sentences(input: str) -> list[str]:
+            raise RuntimeError("tokenizer failed")
+
+        with self.assertRaises(RuntimeError):
+            tokenize_file(str(self.policy_file), split_sentences=failing_split_sentences)
+
+        self.assertEqual(output_file.read_text(encoding="utf-8"), "previous output")
+        self.assertEqual(sorted(os.listdir(self.directory.name)), ["policy.md", "policy.tokenized"])
+
+    def test_refuses_to_overwrite_input(self):
+        with self.assertRaises(ValueError):
+            tokenize_file(
+                str(self.policy_file),
+                output=str(pathlib.Path(self.directory.name, "..", self.directory.name, "policy.md")),
+                split_sentences=split_sentences,
+            )
+
+        self.assertEqual(self.policy_file.read_text(encoding="utf-8"), "".join(policy_lines))
+
+    def test_refuses_to_overwrite_tokenized_input(self):
+        tokenized_file = self.policy_file.with_suffix(".tokenized")
+        tokenized_file.write_text("\n".join(tokenized_lines), encoding="utf-8")
+
+        with self.assertRaises(ValueError):
+            tokenize_file(str(tokenized_file), split_sentences=split_sentences)
+
+        self.assertEqual(tokenized_file.read_text(encoding="utf-8"), "\n".join(tokenized_lines))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,222 @@
+import re
+import unittest
+from unittest import mock
+
+from oscal_pki_policy_converter.parsers import SimpleOscalParser
+from oscal_pki_policy_converter.parsers import simple_oscal_parser
+
+parser_config = {
+    "parser-configuration": {
+        "title": "Test Policy",
+        "version_marker": "Version",
+        "metadata_in_first_section": True,
+        "toc_marker": "Table of Contents",
+        "publication_date_format": "%B %d, %Y",
+        "backmatter_sections": ["References"],
+        "normative_keywords": ["must", "shall", "should"],
+    },
+    "revision-table": {
+        "id_column": 0,
+        "date_column": 1,
+        "detail_column": 2,
+    },
+}
+
+introduction = [
+    "**Version 1.0**",
+    "**January 2, 2024**",
+]
+
+# The parser only keeps a section once it reaches the next header, so every test policy ends with one
+references = ["# References"]
+
+
+uuid_pattern = "[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}"
+
+
+def group_titles(group) -> list:
+    # Returns the titles of a group and its subsections as nested lists, skipping control groups
+    return [
+        group.title,
+        [group_titles(child) for child in group.groups or [] if child.controls is None],
+    ]
+
+
+class TestChapters(unittest.TestCase):
+    def test_blank_top_level_header_folds_into_previous_chapter(self):
+        policy_text = introduction + [
+            "# 1 Introduction",
+            "## 1.1 Overview",
+            "#",
+            "## 1.2 Names",
+            "# 2 Publication",
+            "## 2.1 Repositories",
+        ] + references
+        document = SimpleOscalParser().policy_to_catalog(
+            parse_config=parser_config, policy_text=policy_text
+        )
+
+        self.assertEqual(
+            [group_titles(group) for group in document.catalog.groups],
+            [
+                ["1 Introduction", [["1.1 Overview", []], ["1.2 Names", []]]],
+                ["2 Publication", [["2.1 Repositories", []]]],
+            ],
+        )
+
+    def test_skipped_level_attaches_to_deepest_section(self):
+        policy_text = introduction + [
+            "# 1 Introduction",
+            "### 1.1.1 Skipped a level",
+            "## 1.2 Names",
+            "### 1.2.1 Types of Names",
+        ] + references
+        document = SimpleOscalParser().policy_to_catalog(
+            parse_config=parser_config, policy_text=policy_text
+        )
+
+        self.assertEqual(
+            group_titles(document.catalog.groups[0]),
+            [
+                "1 Introduction",
+                [
+                    ["1.1.1 Skipped a level", []],
+                    ["1.2 Names", [["1.2.1 Types of Names", []]]],
+                ],
+            ],
+        )
+
+    def test_skipped_level_siblings_stay_siblings(self):
+        policy_text = introduction + [
+            "# 1 Introduction",
+            "### 1.0.1 First",
+            "### 1.0.2 Second",
+            "#### 1.0.2.1 Child",
+            "### 1.0.3 Third",
+        ] + references
+        document = SimpleOscalParser().policy_to_catalog(
+            parse_config=parser_config, policy_text=policy_text
+        )
+
+        self.assertEqual(
+            group_titles(document.catalog.groups[0]),
+            [
+                "1 Introduction",
+                [
+                    ["1.0.1 First", []],
+                    ["1.0.2 Second", [["1.0.2.1 Child", []]]],
+                    ["1.0.3 Third", []],
+                ],
+            ],
+        )
+
+
+class TestParallelChapters(unittest.TestCase):
+    def test_workers_produce_same_catalog(self):
+        policy_text = introduction + ["# Table of Contents", "[1 Introduction](#introduction)"]
+        for chapter in range(1, 5):
+            policy_text.append(f"# {chapter} Chapter <span>{chapter}</span>")
+            policy_text.append("This chapter is informative.")
+            for section in range(1, 4):
+                policy_text.append(f"## {chapter}.{section} Section")
+                policy_text.append(f"The CA shall do thing {section}.")
+                policy_text.append(f"### {chapter}.{section}.1 Subsection")
+                policy_text.append("The RA must verify <b>things</b>.")
+        policy_text.extend(references)
+
+        catalogs = []
+        for max_workers in [1, 2]:
+            document = SimpleOscalParser().policy_to_catalog(
+                parse_config=parser_config,
+                policy_text=policy_text,
+                max_workers=max_workers,
+            )
+            # UUIDs and timestamps are different on every run
+            catalog_json = document.model_dump_json(exclude={"catalog": {"metadata": {"last_modified"}}})
+            catalogs.append(
+                re.sub(uuid_pattern, "uuid", catalog_json)
+            )
+
+        self.assertEqual(catalogs[0], catalogs[1])
+
+
+
+class TestStatements(unittest.TestCase):
+    def setUp(self):
+        simple_oscal_parser.normalize_statement.cache_clear()
+
+    def parse_section(self, section_lines: list[str]):
+        # Returns the group for a single section
+        policy_text = introduction + ["# 1 Introduction"] + section_lines + references
+        document = SimpleOscalParser().policy_to_catalog(
+            parse_config=parser_config, policy_text=policy_text
+        )
+        return document.catalog.groups[0]
+
+    def test_tables(self):
+        normative_table = [
+            "<table><tr><td>The CA <b>shall</b> publish</td>",
+            "<td>a CRL</td></tr>",
+            "</table>",
+        ]
+        informative_table = [
+            "<table><tr><td>Some <i>informative</i> text</td>",
+            "</tr>",
+            "</table>",
+        ]
+        # The line before each table is there because a table on the first line of a section is not detected
+        section_group = self.parse_section(
+            ["Informative text."] + normative_table + ["More informative text."] + informative_table
+        )
+
+        statements = [part.prose for part in section_group.groups[0].controls[0].parts]
+        # Table lines are joined with spaces, so the closing tag leaves a trailing space behind
+        self.assertEqual(statements, ["The CA shall publish a CRL "])
+
+        overview = [part.prose for part in section_group.parts]
+        self.assertEqual(
+            overview,
+            ["Informative text.", "More informative text.", " ".join(informative_table)],
+        )
+
+    def test_html_is_stripped_once(self):
+        line = "The CA <b>shall</b> publish a CRL."
+        html_tag_re = mock.Mock(wraps=simple_oscal_parser.html_tag_re)
+        with mock.patch.object(simple_oscal_parser, "html_tag_re", html_tag_re):
+            section_group = self.parse_section([line])
+
+        self.assertEqual(section_group.groups[0].controls[0].parts[0].prose, "The CA shall publish a CRL.")
+        stripped_text = [call.args[1] for call in html_tag_re.sub.call_args_list]
+        self.assertEqual(stripped_text.count(line), 1)
+        self.assertNotIn("The CA shall publish a CRL.", stripped_text)
+
+    def test_repeated_lines_use_cache(self):
+        boilerplate = "The CA shall comply with this policy."
+        self.parse_section([boilerplate])
+        hits = simple_oscal_parser.normalize_statement.cache_info().hits
+
+        self.parse_section([boilerplate, boilerplate])
+
+        self.assertEqual(simple_oscal_parser.normalize_statement.cache_info().hits, hits + 2)
+
+    def test_ids(self):
+        section_group = self.parse_section(
+            ["Informative text.", "The CA shall do one thing.", "The RA must do another."]
+        )
+
+        group_uuid = re.fullmatch(f"group-({uuid_pattern})", section_group.id).group(1)
+        self.assertEqual(section_group.parts[0].id, f"group-{group_uuid}-0")
+
+        control_group = section_group.groups[0]
+        self.assertEqual(control_group.id, f"control-{group_uuid}")
+
+        control = control_group.controls[0]
+        control_uuid = re.fullmatch(f"ctrl-({uuid_pattern})", control.id).group(1)
+        self.assertEqual(
+            [part.id for part in control.parts],
+            [f"stmt-{control_uuid}-1", f"stmt-{control_uuid}-2"],
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()